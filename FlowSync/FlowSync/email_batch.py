@@ -0,0 +1,42 @@
+class EmailBatch:
+    """Column-oriented batch of emails (struct-of-arrays layout).
+
+    Each pipeline pass touches only the column it needs - the noise filter
+    reads subjects, task generation reads subjects/bodies/due dates - instead
+    of hashing into a dict per email per field.
+    """
+
+    __slots__ = ('subjects', 'bodies', 'due_dates')
+
+    def __init__(self, subjects, bodies, due_dates):
+        self.subjects = subjects
+        self.bodies = bodies
+        self.due_dates = due_dates
+
+    def __len__(self):
+        return len(self.subjects)
+
+    @classmethod
+    def from_dicts(cls, emails):
+        subjects = []
+        bodies = []
+        due_dates = []
+        for email in emails:
+            subjects.append(email['subject'])
+            bodies.append(email.get('body', ''))
+            due_dates.append(email.get('due_date'))
+        return cls(subjects, bodies, due_dates)
+
+    def to_dicts(self):
+        return [
+            {'subject': subject, 'body': body, 'due_date': due_date}
+            for subject, body, due_date in zip(self.subjects, self.bodies, self.due_dates)
+        ]
+
+    def select(self, mask):
+        """Return a new batch keeping rows where mask is truthy."""
+        return EmailBatch(
+            [s for s, keep in zip(self.subjects, mask) if keep],
+            [b for b, keep in zip(self.bodies, mask) if keep],
+            [d for d, keep in zip(self.due_dates, mask) if keep],
+        )
@@ -0,0 +1,44 @@
+import json
+
+try:
+    import orjson  # Optional: much faster decoding when installed
+except ImportError:
+    orjson = None
+
+# One reusable decoder instead of the json.loads convenience wrapper,
+# which re-resolves its decoder arguments on every call.
+_decode = json.JSONDecoder().decode
+
+def _loads(payload):
+    if orjson is not None:
+        return orjson.loads(payload)
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode('utf-8')
+    return _decode(payload)
+
+class EmailParser:
+    """Parse email payloads from JSON."""
+
+    def parse(self, email_json):
+        if hasattr(email_json, 'read'):
+            email_json = email_json.read()
+        return _loads(email_json)
+
+    def iter_parse(self, lines):
+        """Stream emails from a JSON Lines source, one record per line.
+
+        Yields each email as soon as its line is read, so peak memory stays
+        flat no matter how large the bulk payload is. Accepts any iterable
+        of lines (an open file streams them without buffering the whole
+        body).
+        """
+        for line in lines:
+            if isinstance(line, (bytes, bytearray)):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if line:
+                yield _loads(line)
+
+if __name__ == '__main__':
+    parser = EmailParser()
+    print(parser.parse('[{"subject": "Task: demo", "body": "..."}]'))
@@ -1,15 +1,38 @@
 import json
+import re
 
 class NoiseFilter:
+    __slots__ = ('irrelevant_keywords', '_kw_lower', '_kw_pattern')
+
     def __init__(self, irrelevant_keywords):
         self.irrelevant_keywords = irrelevant_keywords
+        # Lowercase the keywords once up front instead of on every scan,
+        # and compile them into a single alternation so each subject is
+        # checked against all keywords in one linear pass.
+        self._kw_lower = tuple(keyword.lower() for keyword in irrelevant_keywords)
+        self._kw_pattern = re.compile('|'.join(map(re.escape, self._kw_lower))) if self._kw_lower else None
 
     def filter_emails(self, emails):
-        filtered_emails = []
-        for email in emails:
-            if not any(keyword.lower() in email['subject'].lower() for keyword in self.irrelevant_keywords):
-                filtered_emails.append(email)
-        return filtered_emails
+        if self._kw_pattern is None:
+            return list(emails)
+        search = self._kw_pattern.search
+        return [email for email in emails if search(email['subject'].lower()) is None]
+
+    def keep(self, email):
+        """Single-email predicate: True if the email is not noise."""
+        return self._kw_pattern is None or self._kw_pattern.search(email['subject'].lower()) is None
+
+    def subject_is_noise(self, subject_lower):
+        """Check an already-lowered subject, for callers fusing passes."""
+        return self._kw_pattern is not None and self._kw_pattern.search(subject_lower) is not None
+
+    def filter_batch(self, batch):
+        """Filter a columnar EmailBatch, scanning only the subject column."""
+        if self._kw_pattern is None:
+            return batch
+        search = self._kw_pattern.search
+        mask = [search(subject.lower()) is None for subject in batch.subjects]
+        return batch.select(mask)
 
 if __name__ == '__main__':
     sample_emails = [
@@ -17,4 +40,4 @@ if __name__ == '__main__':
         {"subject": "Spam Email", "body": "Buy now!"}
     ]
     filterer = NoiseFilter(["spam", "buy"])
-    print(filterer.filter_emails(sample_emails))
\ No newline at end of file
+    print(filterer.filter_emails(sample_emails))
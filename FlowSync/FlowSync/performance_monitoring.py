@@ -0,0 +1,63 @@
+import atexit
+import functools
+import logging
+import logging.handlers
+import time
+
+LOG_BUFFER_CAPACITY = 1024
+
+class PerformanceMonitoring:
+    __slots__ = ('logger',)
+
+    def __init__(self, name='FlowSync.performance', buffered=False):
+        self.logger = logging.getLogger(name)
+        if buffered and not self.logger.handlers:
+            # Buffer INFO-level timing records in memory and flush in batches,
+            # so the hot path is not serialized on a write syscall per event.
+            # ERROR and above flush immediately.
+            target = logging.StreamHandler()
+            memory_handler = logging.handlers.MemoryHandler(
+                capacity=LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=target,
+            )
+            self.logger.addHandler(memory_handler)
+            self.logger.propagate = False
+            atexit.register(memory_handler.flush)
+
+    def profile(self, func):
+        """Time a function with the monotonic ns clock and log lazily.
+
+        The record is only formatted when INFO is actually enabled, so
+        profiling a tiny function costs two clock reads and a level check.
+        """
+        log = self.logger
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if log.isEnabledFor(logging.INFO):
+                    log.info('%s took %.6fs', func.__name__, (time.perf_counter_ns() - start) / 1e9)
+
+        return wrapper
+
+    def monitor_api_performance(self, func):
+        """Like profile, but logs failures with the elapsed time at ERROR."""
+        log = self.logger
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                log.error('%s failed after %.6fs', func.__name__, (time.perf_counter_ns() - start) / 1e9)
+                raise
+            if log.isEnabledFor(logging.INFO):
+                log.info('%s took %.6fs', func.__name__, (time.perf_counter_ns() - start) / 1e9)
+            return result
+
+        return wrapper
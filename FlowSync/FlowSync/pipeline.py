@@ -1,16 +1,68 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from FlowSync.noise_filtering import NoiseFilter
 from FlowSync.task_generation import TaskGenerator
 from FlowSync.response_drafting import ResponseDrafting
 
+IRRELEVANT_KEYWORDS = ['spam', 'irrelevant']
+
+
+class EmailPipeline:
+    """Holds the pipeline stages so they are built once, not per email."""
+
+    __slots__ = ('noise_filter', 'task_generator', 'response_drafting', '_pool')
+
+    def __init__(self, irrelevant_keywords=None, api_key=None):
+        self.noise_filter = NoiseFilter(irrelevant_keywords if irrelevant_keywords is not None else IRRELEVANT_KEYWORDS)
+        self.task_generator = TaskGenerator([])
+        self.response_drafting = ResponseDrafting(api_key=api_key)
+        # Shared pool so drafting (network-bound) can overlap task generation
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+    def classify_email(self, email, default_due=None):
+        """Fused pass: noise check, actionable check and due-date parse.
+
+        The subject is fetched and lowered once and all three decisions come
+        out of that single traversal, instead of each stage re-reading the
+        email. Returns (keep, actionable, due); due is None unless the email
+        is actionable.
+        """
+        subject = email.get('subject', '')
+        if self.noise_filter.subject_is_noise(subject.lower()):
+            return False, False, None
+        if TaskGenerator._ACTIONABLE_RE.search(subject) is None:
+            return True, False, None
+        due = TaskGenerator._parse_due_date(email.get('due_date'), default_due)
+        return True, True, due
+
+    def process_email(self, email):
+        keep, actionable, due = self.classify_email(email, datetime.now() + timedelta(days=7))
+        if not keep:
+            return None
+        # Task generation and response drafting both depend only on the
+        # filtered email, so run the network-bound draft while tasks are
+        # built locally.
+        draft_future = self._pool.submit(self.response_drafting.draft_response, [email])
+        tasks = []
+        if actionable:
+            tasks.append({
+                'title': email['subject'],
+                'description': email.get('body', ''),
+                'due_date': due,
+            })
+        return { 'tasks': tasks, 'response': draft_future.result() }
+
+
+_PIPELINE = None
+
+
+def _get_pipeline():
+    global _PIPELINE
+    if _PIPELINE is None:
+        _PIPELINE = EmailPipeline()
+    return _PIPELINE
+
 
 def process_email(email):
-    noise_filter = NoiseFilter(['spam', 'irrelevant'])  # Define irrelevant keywords
-    filtered_email = noise_filter.filter_emails([email])
-    if filtered_email:
-        task_generator = TaskGenerator(filtered_email)
-        tasks = task_generator.generate_tasks()
-        response_drafter = ResponseDrafting(api_key='YOUR_API_KEY')  # Replace with your actual API key
-        response = response_drafter.draft_response(filtered_email)
-        return { 'tasks': tasks, 'response': response }
-    return None
+    return _get_pipeline().process_email(email)
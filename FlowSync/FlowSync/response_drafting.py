@@ -1,26 +1,105 @@
+import functools
 import json
+import os
+import types
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
 from typing import List, Dict, Any
-from unittest.mock import patch
+
+try:
+    import orjson  # Optional: much faster response decoding when installed
+except ImportError:
+    orjson = None
+
+MAX_CONCURRENT_DRAFTS = 8
+MAX_DRAFT_BATCH = 8
+
+@functools.lru_cache(maxsize=1)
+def _load_api_keys():
+    """Read API keys from the environment once and cache the frozen result."""
+    return types.MappingProxyType({'openai_key': os.getenv('OPENAI_API_KEY')})
+
+def _decode_response(response) -> Any:
+    """Decode a response body, preferring orjson over the stdlib parser."""
+    if orjson is not None and isinstance(response.content, (bytes, bytearray)):
+        return orjson.loads(response.content)
+    return response.json()
 
 class ResponseDrafting:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+    __slots__ = ('api_key', 'api_url', '_session', '_payload_template')
+
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key if api_key is not None else self.get_api_keys()['openai_key']
         self.api_url = 'https://api.openai.com/v1/chat/completions'
+        # One pooled session with keep-alive: repeated drafts reuse the TCP/TLS
+        # connection to api.openai.com instead of handshaking per call.
+        self._session = requests.Session()
+        self._session.headers.update({'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONCURRENT_DRAFTS,
+            pool_maxsize=MAX_CONCURRENT_DRAFTS * 2,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self._session.mount('https://', adapter)
+        # Payload skeleton built once; _complete swaps the prompt into a
+        # per-call copy (draft_responses may call it from several threads).
+        self._payload_template = {'model': 'gpt-3.5-turbo', 'messages': None}
+
+    @staticmethod
+    def get_api_keys():
+        return _load_api_keys()
+
+    def draft_responses(self, emails: List[Dict]) -> List[str]:
+        """Draft one response per email, overlapping the network-bound API calls.
+
+        Each draft is a blocking HTTP round trip, so N sequential drafts cost
+        N x RTT; running them on a bounded thread pool brings a batch down to
+        roughly the latency of the slowest call.
+        """
+        if not emails:
+            return []
+        if len(emails) == 1:
+            return [self.draft_response([emails[0]])]
+        batches = [emails[i:i + MAX_DRAFT_BATCH] for i in range(0, len(emails), MAX_DRAFT_BATCH)]
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_DRAFTS, len(batches))) as pool:
+            results = pool.map(self._draft_batch, batches)
+        return [reply for batch_replies in results for reply in batch_replies]
+
+    def _draft_batch(self, emails: List[Dict]) -> List[str]:
+        """Draft replies for up to MAX_DRAFT_BATCH emails in one API call.
+
+        The batch prompt asks for a JSON array of replies; if the model does
+        not return one cleanly, fall back to one call per email.
+        """
+        if len(emails) == 1:
+            return [self.draft_response([emails[0]])]
+        numbered = '\n'.join(f"{i + 1}) {email['body']}" for i, email in enumerate(emails))
+        prompt = (
+            'Draft a human-like response to each of the following emails. '
+            f'Return only a JSON array of {len(emails)} reply strings, in order:\n{numbered}'
+        )
+        try:
+            content = self._complete(prompt)
+            replies = json.loads(content)
+            if isinstance(replies, list) and len(replies) == len(emails):
+                return [str(reply) for reply in replies]
+        except Exception:
+            pass
+        return [self.draft_response([email]) for email in emails]
 
-    @patch('requests.post')  # Mocking the requests.post method for testing
-    def draft_response(self, email_context: List[Dict], mock_post: Any = None) -> str:
-        headers = {'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'}
+    def draft_response(self, email_context: List[Dict]) -> str:
         email_contents = ' '.join(email['body'] for email in email_context)
         prompt = f"Draft a human-like response to the following emails: {email_contents}"
-        data = json.dumps({'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': prompt}]})
+        return self._complete(prompt)
 
-        # Simulate a successful response for testing
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {'choices': [{'message': {'content': 'Here is a response.'}}]}
+    def _complete(self, prompt: str) -> str:
+        """Send one chat-completion request and return the reply content."""
+        payload = dict(self._payload_template)
+        payload['messages'] = [{'role': 'user', 'content': prompt}]
 
-        response = requests.post(self.api_url, headers=headers, data=data)
-        response_data = response.json()
+        response = self._session.post(self.api_url, json=payload, timeout=(3.05, 30))
+        response_data = _decode_response(response)
 
         if response.status_code == 200 and 'choices' in response_data:
             return response_data['choices'][0]['message']['content']
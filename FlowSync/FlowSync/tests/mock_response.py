@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
 class MockResponse:
+    status_code = 200
+    content = b'{"choices": [{"message": {"content": "This is a mock response."}}]}'
+
     @staticmethod
     def json():
         return {
@@ -13,6 +16,6 @@ class MockResponse:
     def raise_for_status():
         pass
 
-@patch('FlowSync.response_drafting.requests.post')
+@patch('FlowSync.response_drafting.requests.Session.post')
 def mock_post(mock_post):
     mock_post.return_value = MockResponse()
@@ -0,0 +1,20 @@
+import pytest
+from FlowSync.email_batch import EmailBatch
+from FlowSync.noise_filtering import NoiseFilter
+
+@pytest.fixture
+def sample_emails():
+    return [
+        {"subject": "Meeting Scheduled", "body": "Upcoming project meeting details...", "due_date": None},
+        {"subject": "Spam Email", "body": "Buy now!", "due_date": None},
+    ]
+
+def test_from_dicts_round_trip(sample_emails):
+    batch = EmailBatch.from_dicts(sample_emails)
+    assert len(batch) == 2
+    assert batch.to_dicts() == sample_emails
+
+def test_filter_batch_matches_filter_emails(sample_emails):
+    noise_filter = NoiseFilter(irrelevant_keywords=["spam", "buy"])
+    batch = noise_filter.filter_batch(EmailBatch.from_dicts(sample_emails))
+    assert batch.to_dicts() == noise_filter.filter_emails(sample_emails)
@@ -0,0 +1,18 @@
+import io
+import pytest
+from FlowSync.email_parser import EmailParser
+
+@pytest.fixture
+def parser():
+    return EmailParser()
+
+def test_parse_accepts_str_and_bytes(parser):
+    payload = '[{"subject": "Task: demo", "body": "..."}]'
+    expected = [{"subject": "Task: demo", "body": "..."}]
+    assert parser.parse(payload) == expected
+    assert parser.parse(payload.encode('utf-8')) == expected
+
+def test_iter_parse_streams_json_lines(parser):
+    lines = io.StringIO('{"subject": "One"}\n\n{"subject": "Two"}\n')
+    emails = list(parser.iter_parse(lines))
+    assert emails == [{"subject": "One"}, {"subject": "Two"}]
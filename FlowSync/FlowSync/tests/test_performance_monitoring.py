@@ -0,0 +1,25 @@
+import logging
+import pytest
+from FlowSync.performance_monitoring import PerformanceMonitoring
+
+@pytest.fixture
+def monitor():
+    return PerformanceMonitoring(name='FlowSync.performance.test')
+
+def test_profile_preserves_result_and_logs(monitor, caplog):
+    @monitor.profile
+    def add(a, b):
+        return a + b
+
+    with caplog.at_level(logging.INFO, logger='FlowSync.performance.test'):
+        assert add(2, 3) == 5
+    assert any('add took' in record.getMessage() for record in caplog.records)
+
+def test_profile_skips_formatting_when_disabled(monitor, caplog):
+    @monitor.profile
+    def noop():
+        return None
+
+    with caplog.at_level(logging.WARNING, logger='FlowSync.performance.test'):
+        noop()
+    assert not caplog.records
@@ -6,7 +6,15 @@ def sample_email():
     return {"subject": "Task needed", "body": "This is an email that requires action.", "due_date": "2023-10-10"}
 
 
-def test_process_email(sample_email):
+@pytest.fixture
+def mock_post(mocker):
+    post = mocker.patch('FlowSync.response_drafting.requests.Session.post')
+    post.return_value.status_code = 200
+    post.return_value.json.return_value = {'choices': [{'message': {'content': 'Here is a response.'}}]}
+    return post
+
+
+def test_process_email(sample_email, mock_post):
     result = process_email(sample_email)
     assert result is not None
     assert 'tasks' in result
@@ -4,9 +4,6 @@ from pathlib import Path
 
 import typer
 
-from pipeline import run_planner, watch_prompt_file
-from prompt_taker import take_prompt
-
 app = typer.Typer(help="Gryffin CLI", invoke_without_command=True)
 
 
@@ -22,6 +19,11 @@ def _load_env() -> None:
 @app.command("start")
 def start(path: str = typer.Argument(".", help="Target directory")) -> None:
     """Capture a prompt and generate planner artifacts."""
+    # Imported here so `gryffin --version`/`--help` never pay for the
+    # pipeline import chain (openai, watchdog, ...)
+    from pipeline import run_planner
+    from prompt_taker import take_prompt
+
     target_dir = Path(path).expanduser().resolve()
     prompt_entry = take_prompt(target_dir)
 
@@ -37,6 +39,8 @@ def start(path: str = typer.Argument(".", help="Target directory")) -> None:
 @app.command("watch")
 def watch(path: str = typer.Argument(".", help="Directory containing prompt.txt")) -> None:
     """Watch prompt.txt and run the planner on changes."""
+    from pipeline import watch_prompt_file
+
     target_dir = Path(path).expanduser().resolve()
     prompt_path = target_dir / "prompt.txt"
     typer.echo(f"Watching {prompt_path} for changes...")
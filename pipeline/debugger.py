@@ -1,13 +1,47 @@
 """Dedicated debugging agent for analyzing and fixing test failures."""
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from .llm import generate_json
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+
+def _dumps_indent(obj: Any) -> str:
+    """Serialize for prompt embedding, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _dumps_files_budgeted(files: dict[str, str], budget: int = 10000) -> str:
+    """Serialize file contents for the prompt without exceeding the budget.
+
+    Trims the dict to roughly the character budget before encoding, so we
+    never serialize megabytes of content just to slice the first 10KB off
+    the result.
+    """
+    trimmed: dict[str, str] = {}
+    used = 0
+    for rel_path, content in files.items():
+        if used >= budget:
+            break
+        kept = content[:budget - used]
+        trimmed[rel_path] = kept
+        # Account for the path, quoting and indentation around each entry
+        used += len(kept) + len(rel_path) + 16
+    return _dumps_indent(trimmed)[:budget]
+
 
 @dataclass
 class DebugFix:
@@ -22,6 +56,39 @@ class DebugFix:
     human_instructions: str | None
 
 
+# Directory names never worth descending into; checked once per directory
+# at the walker, not once per contained path.
+_IGNORE_DIRS = frozenset({"venv", "env", "__pycache__", "node_modules"})
+
+# Source/config suffixes whose contents are worth including in a snapshot
+_SNAPSHOT_SUFFIXES = frozenset({".py", ".js", ".jsx", ".ts", ".tsx", ".json", ".yaml", ".yml", ".ini", ".cfg", ".toml"})
+
+
+def _walk_tree(target_dir: Path) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yield (relative path, DirEntry) for everything under target_dir.
+
+    Uses os.scandir so file/dir type comes from the cached DirEntry instead
+    of a stat() per path, and skips ignored directories without descending
+    into them, so whole __pycache__/node_modules subtrees cost one name check.
+    """
+    stack = [(str(target_dir), "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or name in _IGNORE_DIRS:
+                    continue
+                rel_path = prefix + name
+                yield rel_path, entry
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel_path + "/"))
+
+
 def get_file_tree_with_contents(target_dir: Path, max_files: int = 50) -> dict[str, Any]:
     """Generate file tree snapshot with file contents."""
     tree = {
@@ -29,71 +96,101 @@ def get_file_tree_with_contents(target_dir: Path, max_files: int = 50) -> dict[s
         "files": {}
     }
 
-    # Get directory structure
-    for item in target_dir.rglob("*"):
-        # Skip common directories
-        if any(part.startswith(".") or part in ["venv", "env", "__pycache__", "node_modules"]
-               for part in item.parts):
-            continue
+    # The debugging prompt embeds at most this many structure entries, so
+    # walking a 10k-file tree past both caps is pure wasted traversal
+    structure_cap = 100
 
-        rel_path = item.relative_to(target_dir)
-        tree["structure"].append(str(rel_path))
+    candidates: list[tuple[str, str]] = []
+    for rel_path, entry in _walk_tree(target_dir):
+        if len(tree["structure"]) < structure_cap:
+            tree["structure"].append(rel_path)
+        elif len(candidates) >= max_files:
+            break
 
-        # Include file contents for relevant files
-        if item.is_file() and len(tree["files"]) < max_files:
+        # Collect candidates for content inclusion in walk order, so which
+        # files make the cut stays deterministic
+        if entry.is_file(follow_symlinks=False) and len(candidates) < max_files:
             # Only include source/config files
-            if item.suffix in [".py", ".js", ".jsx", ".ts", ".tsx", ".json", ".yaml", ".yml", ".ini", ".cfg", ".toml"]:
-                try:
-                    content = item.read_text(encoding="utf-8")
-                    tree["files"][str(rel_path)] = content[:5000]  # Limit to 5000 chars
-                except Exception:
-                    pass
+            if os.path.splitext(entry.name)[1] in _SNAPSHOT_SUFFIXES:
+                candidates.append((rel_path, entry.path))
 
-    return tree
+    # Read contents concurrently; the loop is otherwise serialized on disk
+    # latency for every file
+    def _read(paths: tuple[str, str]) -> tuple[str, str | None]:
+        rel, abs_path = paths
+        try:
+            # Read only the 5000-byte prefix we keep, instead of reading and
+            # decoding the whole file just to slice it
+            with open(abs_path, "rb") as handle:
+                raw = handle.read(5000)
+        except Exception:
+            return rel, None
+        if not raw:
+            return rel, None
+        # Cheap binary probe: a NUL byte never appears in text, and the C
+        # scan is far cheaper than raising UnicodeDecodeError per binary
+        if b"\x00" in raw:
+            return rel, None
+        try:
+            return rel, raw.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            # A decode error in the last few bytes just means the read cut a
+            # multi-byte character; anywhere else the file is binary
+            if exc.start >= len(raw) - 3:
+                return rel, raw[:exc.start].decode("utf-8", errors="ignore")
+            return rel, None
 
+    if candidates:
+        with ThreadPoolExecutor(max_workers=min(32, len(candidates))) as pool:
+            for rel_path, content in pool.map(_read, candidates):
+                if content is not None:
+                    tree["files"][rel_path] = content
 
-def analyze_and_fix_test_failure(
-    error_log: str,
-    file_tree: dict[str, Any],
-    target_dir: Path,
-    context: str = "test failure",
-    readme_content: str | None = None
-) -> DebugFix:
-    """
-    Use LLM to analyze test failure and generate comprehensive fix.
+    return tree
 
-    Args:
-        error_log: The test failure output
-        file_tree: File tree snapshot with contents
-        target_dir: Project directory
-        context: Additional context about what was being tested
-        readme_content: Content of README.md for project context
 
-    Returns:
-        DebugFix with all necessary changes
+def update_file_tree_with_fix(tree: dict[str, Any], fix: DebugFix) -> None:
+    """Fold a DebugFix's writes into an existing snapshot in place.
+
+    The fix already names every path it touched, so re-walking the whole
+    tree and re-reading unchanged files between retry attempts buys
+    nothing; patch the snapshot from the fix instead.
     """
-    print(f"\n🔍 Debugging Agent: Analyzing {context}...")
+    for rel_path in fix.files_to_delete:
+        tree["files"].pop(rel_path, None)
 
-    # Prepare the debugging prompt
-    debug_prompt = f"""You are a senior debugging agent analyzing a test failure.
+    known = set(tree["structure"])
+    for file_info in fix.files_to_create + fix.files_to_modify:
+        rel_path = file_info.get("path")
+        if not rel_path:
+            continue
+        if rel_path not in known:
+            tree["structure"].append(rel_path)
+            known.add(rel_path)
+        if os.path.splitext(rel_path)[1] in _SNAPSHOT_SUFFIXES:
+            # Same 5000-char content cap the walker applies
+            tree["files"][rel_path] = file_info.get("content", "")[:5000]
 
-## Context
-{context}
 
-## Project README
-{readme_content if readme_content else "No README available"}
+# Completed analyses keyed by content hash: identical failure + identical
+# snapshot means the network-bound LLM round trip can be skipped entirely
+_ANALYSIS_CACHE: dict[str, DebugFix] = {}
 
-## File Tree Structure
-{json.dumps(file_tree["structure"][:100], indent=2)}
 
-## Relevant File Contents
-{json.dumps(file_tree["files"], indent=2)[:10000]}
+def _analysis_cache_key(error_log: str, file_tree: dict[str, Any], context: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(context.encode("utf-8", "replace"))
+    digest.update(error_log.encode("utf-8", "replace"))
+    for rel_path in file_tree["structure"]:
+        digest.update(rel_path.encode("utf-8", "replace"))
+    for rel_path, content in file_tree["files"].items():
+        digest.update(rel_path.encode("utf-8", "replace"))
+        digest.update(content.encode("utf-8", "replace"))
+    return digest.hexdigest()
 
-## Test Failure Output
-```
-{error_log[:3000]}
-```
 
+# Static tail of the debugging prompt; built once at import
+_DEBUG_TASK_INSTRUCTIONS = """
 ## Your Task
 Analyze this test failure and provide a COMPLETE, AUTONOMOUS fix.
 
@@ -115,8 +212,8 @@ CRITICAL RULES:
 - Only flag needs_human=true if truly impossible to fix (requires credentials, manual setup, etc.)
 
 Return JSON with:
-- files_to_create: Array of {{"path": "relative/path", "content": "full file content"}}
-- files_to_modify: Array of {{"path": "relative/path", "content": "new full content"}}
+- files_to_create: Array of {"path": "relative/path", "content": "full file content"}
+- files_to_modify: Array of {"path": "relative/path", "content": "new full content"}
 - files_to_delete: Array of file paths to delete
 - commands_to_run: Array of shell commands to execute (in order)
 - explanation: Detailed explanation of what was wrong and how you fixed it
@@ -125,6 +222,53 @@ Return JSON with:
 - human_instructions: (only if needs_human=true) step-by-step instructions
 """
 
+
+def analyze_and_fix_test_failure(
+    error_log: str,
+    file_tree: dict[str, Any],
+    target_dir: Path,
+    context: str = "test failure",
+    readme_content: str | None = None
+) -> DebugFix:
+    """
+    Use LLM to analyze test failure and generate comprehensive fix.
+
+    Args:
+        error_log: The test failure output
+        file_tree: File tree snapshot with contents
+        target_dir: Project directory
+        context: Additional context about what was being tested
+        readme_content: Content of README.md for project context
+
+    Returns:
+        DebugFix with all necessary changes
+    """
+    print(f"\n🔍 Debugging Agent: Analyzing {context}...")
+
+    cache_key = _analysis_cache_key(error_log, file_tree, context)
+    cached = _ANALYSIS_CACHE.get(cache_key)
+    if cached is not None:
+        print("✓ Reusing cached analysis for identical failure and snapshot")
+        return cached
+
+    # Assemble the debugging prompt from parts and join once, instead of
+    # interpolating the large README/tree/log strings through an f-string
+    # (which copies every piece into one more full-size buffer)
+    debug_prompt = "".join([
+        "You are a senior debugging agent analyzing a test failure.\n\n## Context\n",
+        context,
+        "\n\n## Project README\n",
+        readme_content if readme_content else "No README available",
+        "\n\n## File Tree Structure\n",
+        _dumps_indent(file_tree["structure"][:100]),
+        "\n\n## Relevant File Contents\n",
+        _dumps_files_budgeted(file_tree["files"]),
+        "\n\n## Test Failure Output\n```\n",
+        error_log[:3000],
+        "\n```\n",
+        _DEBUG_TASK_INSTRUCTIONS,
+    ])
+
     result = generate_json(
         "You are a world-class debugging agent who ALWAYS provides autonomous fixes. You analyze test failures deeply and generate complete, working solutions. Return only valid JSON with all required fields.",
         debug_prompt
@@ -142,7 +286,7 @@ Return JSON with:
             human_instructions="Please manually review the test failures."
         )
 
-    return DebugFix(
+    fix = DebugFix(
         files_to_create=result.get("files_to_create", []),
         files_to_modify=result.get("files_to_modify", []),
         files_to_delete=result.get("files_to_delete", []),
@@ -152,3 +296,5 @@ Return JSON with:
         needs_human=result.get("needs_human", False),
         human_instructions=result.get("human_instructions")
     )
+    _ANALYSIS_CACHE[cache_key] = fix
+    return fix
@@ -1,20 +1,36 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 import re
 from typing import Any, Optional
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# orjson decodes model output several times faster than stdlib json and
+# accepts str input directly, so the swap is a drop-in
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 class LLMError(RuntimeError):
     pass
 
 
-def get_client() -> Any:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        return None
+# Compiled once; re.search with an inline pattern re-checks the regex cache
+# on every response
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+_JSON_BODY_RE = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+
 
+# One client per key: constructing OpenAI() builds a fresh httpx pool and
+# SSL context each time, and reusing it keeps the connection alive across
+# the hundreds of generate_json calls a run can make
+@functools.lru_cache(maxsize=1)
+def _build_client(api_key: str) -> Any:
     try:
         from openai import OpenAI  # type: ignore
 
@@ -29,21 +45,47 @@ def get_client() -> Any:
             return None
 
 
+def get_client() -> Any:
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    return _build_client(api_key)
+
+
 def _extract_json(text: str) -> Any:
     text = text.strip()
     if not text:
         raise LLMError("Empty response from LLM")
 
     if text[0] in "[{":
-        return json.loads(text)
+        return _json_loads(text)
+
+    # Fenced responses (```json ... ```) are the common case; strip the
+    # fence in one anchored match instead of scanning for braces. A fence
+    # body that isn't pure JSON (prose around the object) falls through to
+    # the brace search, which the pre-fence code handled on its own.
+    match = _JSON_FENCE_RE.match(text)
+    if match:
+        try:
+            return _json_loads(match.group(1))
+        except ValueError:
+            pass
 
-    match = re.search(r"(\{.*\}|\[.*\])", text, flags=re.DOTALL)
+    match = _JSON_BODY_RE.search(text)
     if not match:
         raise LLMError("No JSON found in LLM response")
-    return json.loads(match.group(1))
+    return _json_loads(match.group(1))
+
+
+# Whether the endpoint accepts response_format=json_object, learned from
+# the first call: servers without it otherwise pay a failed round-trip
+# on every generate_json before the fallback fires
+_RESPONSE_FORMAT_OK: bool | None = None
 
 
 def generate_json(system_prompt: str, user_prompt: str, model: str = "gpt-4o-mini") -> Optional[Any]:
+    global _RESPONSE_FORMAT_OK
+
     client = get_client()
     if client is None:
         return None
@@ -55,13 +97,25 @@ def generate_json(system_prompt: str, user_prompt: str, model: str = "gpt-4o-min
 
     try:
         if hasattr(client, "chat") and hasattr(client.chat, "completions"):
-            try:
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    response_format={"type": "json_object"},
-                )
-            except Exception:
+            response = None
+            if _RESPONSE_FORMAT_OK is not False:
+                try:
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        response_format={"type": "json_object"},
+                    )
+                    _RESPONSE_FORMAT_OK = True
+                except Exception as exc:
+                    # Only latch when the error rejects the parameter
+                    # itself (an SDK TypeError for the unknown kwarg, or a
+                    # server error naming it); a transient network failure
+                    # or rate limit must not permanently disable
+                    # json_object mode, so anything else leaves the
+                    # capability unknown and the next call re-probes
+                    if isinstance(exc, TypeError) or "response_format" in str(exc):
+                        _RESPONSE_FORMAT_OK = False
+            if response is None:
                 response = client.chat.completions.create(model=model, messages=messages)
 
             content = response.choices[0].message.content
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import functools
 import json
+import sys
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from .llm import LLMError, generate_json
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 
 @dataclass(frozen=True)
 class PlanArtifacts:
@@ -84,108 +94,178 @@ def _fallback_tasks(prompt: str) -> dict[str, Any]:
 
 def _write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        # orjson serializes straight to bytes, so the artifact lands on disk
+        # in one write with no intermediate str encode
+        path.write_bytes(
+            orjson.dumps(
+                payload,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+            )
+        )
+        return
     with path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, sort_keys=True, ensure_ascii=True)
         handle.write("\n")
 
 
+# Successful generations keyed by (system prompt, user prompt): re-planning
+# the same prompt (watch-mode re-saves, feedback loops that only change one
+# artifact) skips the LLM round trip entirely. Fallbacks and malformed
+# responses are not cached so a client that comes back online (or stops
+# hallucinating the shape) is retried.
+_PLAN_CACHE: dict[tuple[str, str], dict[str, Any]] = {}
+
+
+def _generate_cached(
+    system_prompt: str,
+    prompt: str,
+    valid: Callable[[dict[str, Any]], bool],
+) -> dict[str, Any] | None:
+    cached = _PLAN_CACHE.get((system_prompt, prompt))
+    if cached is not None:
+        return cached
+    result = generate_json(system_prompt, prompt)
+    # Only shape-valid responses enter the cache; a hallucinated shape
+    # would otherwise pin this prompt to the fallback for the whole run
+    if isinstance(result, dict) and valid(result):
+        _PLAN_CACHE[(system_prompt, prompt)] = result
+    return result
+
+
+# Keys the system prompts ask for, checked once at the generation boundary
+# so malformed responses fall back here instead of surfacing as N/A rows
+# deep in review/execution
+_ARCHITECTURE_KEYS = frozenset({"app_name", "overview", "components", "data_flow", "tech_stack", "risks", "assumptions"})
+
+
 def generate_architecture(prompt: str) -> dict[str, Any]:
-    result = generate_json(ARCHITECTURE_SYSTEM, prompt)
+    result = _generate_cached(
+        ARCHITECTURE_SYSTEM, prompt, lambda r: not _ARCHITECTURE_KEYS.isdisjoint(r)
+    )
     if result is None:
         return _fallback_architecture(prompt)
     if not isinstance(result, dict):
         raise LLMError("Architecture response was not a JSON object")
+    if _ARCHITECTURE_KEYS.isdisjoint(result):
+        # A JSON object with none of the requested keys is a hallucinated
+        # shape; the fallback is more useful than an empty review screen
+        return _fallback_architecture(prompt)
     return result
 
 
 def generate_major_tasks(prompt: str) -> dict[str, Any]:
-    result = generate_json(TASKS_SYSTEM, prompt)
+    result = _generate_cached(
+        TASKS_SYSTEM, prompt, lambda r: isinstance(r.get("major_tasks"), list)
+    )
     if result is None:
         return _fallback_tasks(prompt)
     if not isinstance(result, dict):
         raise LLMError("Major tasks response was not a JSON object")
+    if not isinstance(result.get("major_tasks"), list):
+        return _fallback_tasks(prompt)
     return result
 
 
-def _review_and_approve(architecture: dict[str, Any], tasks: dict[str, Any], current_prompt: str) -> tuple[bool, str]:
-    """Review the generated artifacts and get user approval or feedback."""
-    print("\n" + "=" * 60)
-    print("📋 ARCHITECTURE REVIEW")
-    print("=" * 60)
-    print(f"\nApp Name: {architecture.get('app_name', 'N/A')}")
-    print(f"\nOverview: {architecture.get('overview', 'N/A')}")
+def _feedback_scope(feedback: str) -> str:
+    """Classify which artifact a piece of feedback targets.
 
-    print("\nComponents:")
+    Returns "architecture", "tasks", or "both"; ambiguous or unscoped
+    feedback regenerates both, so this only ever skips work it can
+    attribute to one artifact.
+    """
+    lowered = feedback.lower()
+    wants_architecture = any(word in lowered for word in ("architecture", "tech stack", "component", "data flow"))
+    wants_tasks = any(word in lowered for word in ("task", "dependen", "acceptance"))
+    if wants_architecture and not wants_tasks:
+        return "architecture"
+    if wants_tasks and not wants_architecture:
+        return "tasks"
+    return "both"
+
+
+def _review_and_approve(architecture: dict[str, Any], tasks: dict[str, Any], current_prompt: str) -> tuple[bool, str, str]:
+    """Review the generated artifacts and get user approval or feedback."""
+    # Build the whole review as one list of lines and flush it with a single
+    # writelines call; a print per row means a stdout lock acquisition and a
+    # write syscall per row, which dominates latency on long task lists
+    out = ["\n" + "=" * 60 + "\n"]
+    out.append("📋 ARCHITECTURE REVIEW\n")
+    out.append("=" * 60 + "\n")
+    out.append(f"\nApp Name: {architecture.get('app_name', 'N/A')}\n")
+    out.append(f"\nOverview: {architecture.get('overview', 'N/A')}\n")
+
+    out.append("\nComponents:\n")
     components = architecture.get('components', {})
     if isinstance(components, dict):
         for name, description in components.items():
-            print(f"  • {name}: {description}")
+            out.append(f"  • {name}: {description}\n")
     elif isinstance(components, list):
         for comp in components:
             if isinstance(comp, dict):
-                print(f"  • {comp.get('name', 'N/A')}: {comp.get('responsibility', 'N/A')}")
+                out.append(f"  • {comp.get('name', 'N/A')}: {comp.get('responsibility', 'N/A')}\n")
             else:
-                print(f"  • {comp}")
+                out.append(f"  • {comp}\n")
 
     tech_stack = architecture.get('tech_stack', {})
     if isinstance(tech_stack, list):
-        print("\nTech Stack:")
+        out.append("\nTech Stack:\n")
         for tech in tech_stack:
-            print(f"  • {tech}")
+            out.append(f"  • {tech}\n")
     else:
-        print(f"\nTech Stack: {json.dumps(tech_stack, indent=2)}")
+        out.append(f"\nTech Stack: {json.dumps(tech_stack, indent=2)}\n")
 
     risks = architecture.get('risks', [])
     if risks:
-        print("\nRisks:")
+        out.append("\nRisks:\n")
         for risk in risks:
-            print(f"  ⚠️  {risk}")
+            out.append(f"  ⚠️  {risk}\n")
 
     assumptions = architecture.get('assumptions', [])
     if assumptions:
-        print("\nAssumptions:")
+        out.append("\nAssumptions:\n")
         for assumption in assumptions:
-            print(f"  💡 {assumption}")
+            out.append(f"  💡 {assumption}\n")
 
-    print("\n" + "=" * 60)
-    print("📝 MAJOR TASKS")
-    print("=" * 60)
+    out.append("\n" + "=" * 60 + "\n")
+    out.append("📝 MAJOR TASKS\n")
+    out.append("=" * 60 + "\n")
     for i, task in enumerate(tasks.get('major_tasks', []), 1):
-        print(f"\n{i}. {task.get('title', 'N/A')}")
+        out.append(f"\n{i}. {task.get('title', 'N/A')}\n")
         description = task.get('description', 'N/A')
         # Format multi-line descriptions with proper indentation
         if description and len(description) > 80:
-            import textwrap
-            wrapped = textwrap.fill(description, width=70, initial_indent='   ', subsequent_indent='   ')
-            print(f"\n{wrapped}")
+            out.append(f"\n{_DESCRIPTION_WRAPPER.fill(description)}\n")
         else:
-            print(f"   {description}")
+            out.append(f"   {description}\n")
         dependencies = task.get('dependencies', [])
         if dependencies:
-            print(f"   Dependencies: {', '.join(dependencies)}")
+            out.append(f"   Dependencies: {', '.join(dependencies)}\n")
         acceptance = task.get('acceptance_criteria', [])
         if acceptance:
-            print(f"   Acceptance Criteria:")
+            out.append("   Acceptance Criteria:\n")
             for criterion in acceptance:
-                print(f"     ✓ {criterion}")
+                out.append(f"     ✓ {criterion}\n")
 
-    print("\n" + "=" * 60)
-    print("\nOptions:")
-    print("  1. Approve and start execution")
-    print("  2. Request changes (provide feedback)")
-    print("  3. Cancel")
+    out.append("\n" + "=" * 60 + "\n")
+    out.append("\nOptions:\n")
+    out.append("  1. Approve and start execution\n")
+    out.append("  2. Request changes (provide feedback)\n")
+    out.append("  3. Cancel\n")
+    sys.stdout.writelines(out)
+    sys.stdout.flush()
 
     while True:
         choice = input("\nYour choice (1/2/3): ").strip()
 
         if choice == "1":
-            return True, current_prompt
+            return True, current_prompt, "both"
         elif choice == "2":
             feedback = input("\nWhat changes would you like? (describe your feedback): ").strip()
             if feedback:
                 new_prompt = f"{current_prompt}\n\nUser feedback: {feedback}"
                 print("\n🔄 Regenerating with your feedback...\n")
-                return False, new_prompt
+                return False, new_prompt, _feedback_scope(feedback)
             else:
                 print("No feedback provided. Please try again.")
         elif choice == "3":
@@ -200,21 +280,44 @@ def run_planner(prompt: str, target_dir: str | Path, interactive: bool = False,
 
     current_prompt = prompt
     approved = False
+    architecture: dict[str, Any] = {}
+    tasks: dict[str, Any] = {}
+    # On feedback iterations, only regenerate the artifact the feedback
+    # actually targets; the other keeps its previous generation
+    scope = "both"
 
     while not approved:
-        architecture = generate_architecture(current_prompt)
-        tasks = generate_major_tasks(current_prompt)
+        # The two generations are independent network-bound LLM calls, so
+        # overlapping them costs one round trip instead of two
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            architecture_future = (
+                pool.submit(generate_architecture, current_prompt) if scope != "tasks" else None
+            )
+            tasks_future = (
+                pool.submit(generate_major_tasks, current_prompt) if scope != "architecture" else None
+            )
+            if architecture_future is not None:
+                architecture = architecture_future.result()
+            if tasks_future is not None:
+                tasks = tasks_future.result()
 
         architecture_path = target_path / "architecture.json"
         major_tasks_path = target_path / "majortasks.json"
 
-        _write_json(architecture_path, architecture)
-        _write_json(major_tasks_path, tasks)
+        # Land both artifacts at once; the GIL is released for the duration
+        # of each write syscall
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            write_futures = [
+                pool.submit(_write_json, architecture_path, architecture),
+                pool.submit(_write_json, major_tasks_path, tasks),
+            ]
+            for future in write_futures:
+                future.result()
 
         if not interactive:
             approved = True
         else:
-            approved, current_prompt = _review_and_approve(architecture, tasks, current_prompt)
+            approved, current_prompt, scope = _review_and_approve(architecture, tasks, current_prompt)
 
     # Start execution if approved and requested
     if approved and start_execution:
@@ -231,29 +334,76 @@ def _extract_prompt_line(line: str) -> str:
     stripped = line.strip()
     if not stripped:
         return ""
-    if stripped.startswith("[") and "]" in stripped:
-        _, _, remainder = stripped.partition("]")
-        return remainder.strip()
+    # One scan for the closing bracket instead of a containment check plus
+    # a partition that re-scans and builds a throwaway tuple
+    if stripped[0] == "[":
+        end = stripped.find("]")
+        if end != -1:
+            return stripped[end + 1:].strip()
     return stripped
 
 
+# Only the last non-blank line matters, so reading more than this much of
+# the tail of a long-running prompt log is wasted I/O
+_PROMPT_TAIL_BYTES = 4096
+
+
 def _latest_prompt(prompt_path: Path) -> str:
-    if not prompt_path.exists():
+    tail_bytes = _PROMPT_TAIL_BYTES
+    try:
+        with prompt_path.open("rb") as handle:
+            handle.seek(0, 2)
+            size = handle.tell()
+            while True:
+                offset = max(0, size - tail_bytes)
+                handle.seek(offset)
+                tail = handle.read()
+
+                # Seeking mid-file may have split a line; drop the partial
+                # first line
+                if offset:
+                    cut = tail.find(b"\n")
+                    if cut == -1:
+                        # The last line alone is longer than the window;
+                        # read further back rather than truncating it
+                        tail_bytes *= 2
+                        continue
+                    tail = tail[cut + 1:]
+
+                for line in reversed(tail.decode("utf-8", errors="replace").splitlines()):
+                    if line.strip():
+                        return _extract_prompt_line(line)
+                if offset == 0:
+                    return ""
+                # Every complete line in the window was blank (the last
+                # line straddles the window start); widen and retry
+                tail_bytes *= 2
+    except OSError:
         return ""
 
-    with prompt_path.open("r", encoding="utf-8") as handle:
-        lines = [line for line in (l.rstrip("\n") for l in handle) if line.strip()]
 
-    if not lines:
-        return ""
+# One wrapper for all task descriptions: TextWrapper.__init__ compiles
+# regexes, so building a fresh one per fill() call is pure overhead
+_DESCRIPTION_WRAPPER = textwrap.TextWrapper(width=70, initial_indent='   ', subsequent_indent='   ')
 
-    return _extract_prompt_line(lines[-1])
 
+# Editors fire several filesystem events per save (and users save in
+# bursts); wait this long after the last event before running the planner
+_WATCH_DEBOUNCE_SECONDS = 0.2
 
-def watch_prompt_file(prompt_path: str | Path, target_dir: str | Path) -> None:
+
+@functools.cache
+def _watchdog() -> tuple[type, type]:
+    """Resolve the optional watchdog dependency once, on first use."""
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
 
+    return FileSystemEventHandler, Observer
+
+
+def watch_prompt_file(prompt_path: str | Path, target_dir: str | Path) -> None:
+    FileSystemEventHandler, Observer = _watchdog()
+
     prompt_path = Path(prompt_path)
     target_dir = Path(target_dir)
     watch_dir = prompt_path.parent
@@ -261,20 +411,44 @@ def watch_prompt_file(prompt_path: str | Path, target_dir: str | Path) -> None:
     last_prompt = ""
 
     class _PromptHandler(FileSystemEventHandler):
+        def __init__(self) -> None:
+            self._timer: threading.Timer | None = None
+            self._timer_lock = threading.Lock()
+            # Serializes planner runs: debounce timers fire on their own
+            # threads, and saves spaced wider than the debounce but closer
+            # than one run_planner (LLM calls take seconds) must not
+            # overlap LLM spend or interleave the artifact writes
+            self._run_lock = threading.Lock()
+
         def on_modified(self, event) -> None:  # type: ignore[override]
-            nonlocal last_prompt
             if Path(event.src_path) != prompt_path:
                 return
-            prompt = _latest_prompt(prompt_path)
-            if not prompt or prompt == last_prompt:
-                return
-            last_prompt = prompt
-            print(f"\n✓ Detected change in prompt.txt")
-            print(f"  Prompt: {prompt}")
-            print(f"  Running planner...\n")
-            run_planner(prompt, target_dir)
-            print(f"✓ Architecture updated: {target_dir / 'architecture.json'}")
-            print(f"✓ Tasks updated: {target_dir / 'majortasks.json'}\n")
+            # Coalesce the burst: each event resets the timer, so one save
+            # (or a rapid series of saves) triggers exactly one planner run
+            # against whatever the file says once the burst settles
+            with self._timer_lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(_WATCH_DEBOUNCE_SECONDS, self._process)
+                self._timer.daemon = True
+                self._timer.start()
+
+        def _process(self) -> None:
+            nonlocal last_prompt
+            with self._run_lock:
+                # Re-read under the lock: a run queued behind an in-flight
+                # one sees the file as it is now and dedups against the
+                # prompt that run just handled
+                prompt = _latest_prompt(prompt_path)
+                if not prompt or prompt == last_prompt:
+                    return
+                last_prompt = prompt
+                print(f"\n✓ Detected change in prompt.txt")
+                print(f"  Prompt: {prompt}")
+                print(f"  Running planner...\n")
+                run_planner(prompt, target_dir)
+                print(f"✓ Architecture updated: {target_dir / 'architecture.json'}")
+                print(f"✓ Tasks updated: {target_dir / 'majortasks.json'}\n")
 
         def on_created(self, event) -> None:  # type: ignore[override]
             self.on_modified(event)
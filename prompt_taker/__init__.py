@@ -1,3 +1,3 @@
-from .main import PromptEntry, take_prompt
+from .main import PromptEntry, PromptSink, take_prompt
 
-__all__ = ["PromptEntry", "take_prompt"]
+__all__ = ["PromptEntry", "PromptSink", "take_prompt"]
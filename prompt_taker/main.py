@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 
 
@@ -13,18 +13,55 @@ class PromptEntry:
 
 
 def _timestamp_utc() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    # Same ...Z format as the old isoformat().replace() chain, formatted
+    # in one strftime call instead of three intermediate strings
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
-def take_prompt(target_dir: str | Path, question: str = "what are we building today?: ") -> PromptEntry:
+class PromptSink:
+    """Holds prompt.txt open so repeated appends cost one write each.
+
+    take_prompt opens and closes the file per call — fine for a single
+    CLI invocation, but a REPL-style caller pays open/write/close per
+    entry. Keeping one line-buffered handle for the session reduces that
+    to a single buffered write; appends are append-only, so concurrent
+    writers still interleave whole lines.
+    """
+
+    def __init__(self, prompt_path: Path) -> None:
+        self.prompt_path = prompt_path
+        self._handle = prompt_path.open("a", buffering=1, encoding="utf-8")
+
+    def write(self, timestamp: str, prompt: str) -> None:
+        self._handle.write(f"[{timestamp}] {prompt}\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> PromptSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def take_prompt(
+    target_dir: str | Path,
+    question: str = "what are we building today?: ",
+    sink: PromptSink | None = None,
+) -> PromptEntry:
     prompt = ""
     while not prompt:
         prompt = input(question).strip()
 
+    timestamp = _timestamp_utc()
+    if sink is not None:
+        sink.write(timestamp, prompt)
+        return PromptEntry(prompt=prompt, timestamp=timestamp, prompt_path=sink.prompt_path)
+
     target_path = Path(target_dir)
     target_path.mkdir(parents=True, exist_ok=True)
 
-    timestamp = _timestamp_utc()
     prompt_path = target_path / "prompt.txt"
     with prompt_path.open("a", encoding="utf-8") as handle:
         handle.write(f"[{timestamp}] {prompt}\n")